@@ -0,0 +1,10 @@
+# SynthClient is imported lazily so the synthapi script can forward commands to
+# a running daemon without paying for the client's dependencies first
+__all__ = ["SynthClient", "SynthAPIError"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import client
+        return getattr(client, name)
+    raise AttributeError(f"module 'synthapi' has no attribute '{name}'")
@@ -4,20 +4,78 @@ import requests
 import typer
 import os
 from dotenv import load_dotenv
+from .cassette import Cassette, CassetteMiss, MISS_POLICIES
+from .compression import compress, decompress
+from .response_validation import get_response_validator
+from .streaming import OUTPUT_FORMATS, render_response
 
 load_dotenv()
 
 # Get Lambda URL from environment
 LAMBDA_GET_URL = os.getenv('LAMBDA_GET_URL', 'https://u7kdlpmkuocxml5jy4a4jrpclu0gyosv.lambda-url.us-east-1.on.aws/')
 
+# Parsed specs keyed by path, reused while the file is unchanged (matters for long-lived processes)
+_spec_cache = {}
+
+# Shared session so repeated requests from one process reuse pooled connections
+_session = None
+
 def load_api_spec(api_name, generated_api_dir):
     """Load and parse an API specification file"""
     spec_path = generated_api_dir / f"{api_name}.json"
-    if not spec_path.exists():
+    try:
+        stat = spec_path.stat()
+    except FileNotFoundError:
+        _spec_cache.pop(spec_path, None)
         return None
+    
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _spec_cache.get(spec_path)
+    if cached and cached[0] == stamp:
+        return cached[1]
         
-    with open(spec_path) as f:
-        return json.load(f)
+    # Specs may be saved compressed (see SYNTHAPI_SPEC_COMPRESSION)
+    with open(spec_path, 'rb') as f:
+        spec = json.loads(decompress(f.read()))
+    _spec_cache[spec_path] = (stamp, spec)
+    return spec
+
+def save_api_spec(api_name, spec, generated_api_dir, compression=None):
+    """
+    Save an API specification as compact JSON, optionally compressed
+
+    Returns:
+        tuple: (bytes written, bytes the indented JSON would have taken)
+    """
+    spec_path = generated_api_dir / f"{api_name}.json"
+    content = json.dumps(spec, separators=(',', ':')).encode('utf-8')
+    if compression:
+        content = compress(content, compression)
+    
+    # Write to a temporary file and rename so readers never see a partial spec
+    tmp_path = spec_path.with_name(f".{spec_path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, spec_path)
+    
+    indented_size = len(json.dumps(spec, indent=2).encode('utf-8'))
+    return len(content), indented_size
+
+def get_session():
+    """Return the process-wide HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+def compile_routes(spec):
+    """Map each endpoint path to its GET operation so lookups are a single dict access"""
+    routes = {}
+    for path, operations in spec.get('paths', {}).items():
+        operation = operations.get('get')
+        if operation:
+            routes[path] = operation
+    return routes
 
 def validate_parameters(params, endpoint_spec):
     """Validate provided parameters against the endpoint specification"""
@@ -67,8 +125,15 @@ def validate_parameters(params, endpoint_spec):
     
     return True, None
 
-def make_request(api_name, endpoint, params):
-    """Make the GET request to the Lambda endpoint"""
+def make_request(api_name, endpoint, params, cassette=None, stream=False, session=None):
+    """Make the GET request to the Lambda endpoint, optionally through a cassette or a pooled session"""
+    if cassette is not None and cassette.mode == 'replay':
+        response = cassette.replay(endpoint, params)
+        if response is not None:
+            return response
+        if cassette.on_miss == 'fail':
+            raise CassetteMiss(f"No recorded response for {endpoint} with params {params}")
+    
     # Add API name and endpoint to parameters
     request_params = {
         'API_NAME': api_name,
@@ -81,12 +146,17 @@ def make_request(api_name, endpoint, params):
         'User-Agent': 'synthapi-client/0.1.0'
     }
     
-    response = requests.get(
+    response = (session or get_session()).get(
         LAMBDA_GET_URL.rstrip('/'),
         params=request_params,
-        headers=headers
+        headers=headers,
+        stream=stream
     )
     
+    # Record mode captures everything; replay mode captures passthrough misses
+    if cassette is not None:
+        cassette.record(endpoint, params, response)
+    
     return response
 
 def get(
@@ -95,7 +165,12 @@ def get(
     location=typer.Option(None, "--location", help="Location parameter"),
     term=typer.Option(None, "--term", help="Search term"),
     latitude=typer.Option(None, "--latitude", help="Latitude for location"),
-    longitude=typer.Option(None, "--longitude", help="Longitude for location")
+    longitude=typer.Option(None, "--longitude", help="Longitude for location"),
+    record: bool = typer.Option(False, "--record", help="Record the response into the API's cassette"),
+    replay: bool = typer.Option(False, "--replay", help="Answer from the API's cassette instead of the network"),
+    on_miss=typer.Option("fail", "--on-miss", help="Replay miss policy: fail or passthrough (request and record)"),
+    output_format=typer.Option("pretty", "--format", "-f", help="Output format: pretty, compact or ndjson (one array element per line)"),
+    validate_response: bool = typer.Option(False, "--validate-response", help="Check the response against the endpoint's response schema")
 ):
     """Make a GET request to a registered API endpoint with parameter validation"""
     # Get the generated APIs directory from the package location
@@ -131,21 +206,59 @@ def get(
         typer.echo(f"❌ Error: {error}")
         raise typer.Exit(1)
     
+    if record and replay:
+        typer.echo("❌ Error: --record and --replay cannot be used together")
+        raise typer.Exit(1)
+    if on_miss not in MISS_POLICIES:
+        typer.echo(f"❌ Error: Invalid --on-miss value. Must be one of: {', '.join(MISS_POLICIES)}")
+        raise typer.Exit(1)
+    if output_format not in OUTPUT_FORMATS:
+        typer.echo(f"❌ Error: Invalid --format value. Must be one of: {', '.join(OUTPUT_FORMATS)}")
+        raise typer.Exit(1)
+    
+    cassette = None
+    if record or replay:
+        cassette = Cassette(api_name, mode="record" if record else "replay", on_miss=on_miss)
+    
     # Make the request
     try:
-        response = make_request(api_name, endpoint, param_dict)
+        response = make_request(api_name, endpoint, param_dict, cassette=cassette, stream=True)
         
         # Print response details
         typer.echo(f"\nRequest URL: {response.url}")
         typer.echo(f"Status: {response.status_code}")
         typer.echo("\nResponse:")
+        
+        validator = None
+        if validate_response:
+            validator = get_response_validator(spec, endpoint, response.status_code)
+        
         try:
-            # Try to pretty print JSON response
-            typer.echo(json.dumps(response.json(), indent=2))
-        except:
-            # Fallback to raw text if not JSON
-            typer.echo(response.text)
+            # Stream the body so large array responses print as they arrive
+            render_response(response, output_format, validator)
+        except ValueError as e:
+            typer.echo(f"\n❌ Error: Could not parse response body: {str(e)}")
+            raise typer.Exit(1)
+        finally:
+            response.close()
+        
+        if validate_response:
+            if validator is None:
+                typer.echo(f"\n• No response schema for status {response.status_code}, skipping validation")
+            elif validator.ok:
+                typer.echo(f"\n✓ Response matches schema ({validator.records} records, {validator.records_per_second:,.0f} records/s)")
+            else:
+                typer.echo(f"\n✗ Response does not match schema ({validator.error_count} errors in {validator.records} records):")
+                for error in validator.errors:
+                    typer.echo(f"  • {error}")
+                raise typer.Exit(1)
             
+    except CassetteMiss as e:
+        typer.echo(f"❌ Error: {str(e)}")
+        raise typer.Exit(1)
     except requests.RequestException as e:
         typer.echo(f"❌ Error making request: {str(e)}")
-        raise typer.Exit(1)
\ No newline at end of file
+        raise typer.Exit(1)
+    finally:
+        if cassette is not None:
+            cassette.close()
\ No newline at end of file
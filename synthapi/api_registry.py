@@ -1,10 +1,15 @@
+import copy
 import json
+import shutil
 from pathlib import Path
 from typing import List, Dict
 
 REGISTRY_FILE = Path(__file__).parent / "api_registry.json"
 GENERATED_API_DIR = Path(__file__).parent / "generated_apis"
 
+# Last parsed registry and the (mtime, size) it was read at
+_registry_cache = None
+
 def clean_registry():
     """Reset the registry to initial state and clean generated files"""
     # Reset registry file
@@ -21,19 +26,30 @@ def clean_registry():
             file.unlink()
         for file in GENERATED_API_DIR.glob("*.txt"):
             file.unlink()
+        # Stored spec versions belong to registry entries that no longer exist
+        shutil.rmtree(GENERATED_API_DIR / "versions", ignore_errors=True)
         
     return True
 
 def get_registry_data() -> Dict:
     """Returns the full registry data including initialization status"""
-    if not REGISTRY_FILE.exists():
+    global _registry_cache
+    try:
+        stat = REGISTRY_FILE.stat()
+    except FileNotFoundError:
         return {"apis": {}}
     
-    with open(REGISTRY_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {"apis": {}}
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    if _registry_cache is None or _registry_cache[0] != stamp:
+        with open(REGISTRY_FILE, "r") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                return {"apis": {}}
+        _registry_cache = (stamp, data)
+    
+    # Callers modify the result before writing it back, so hand out a copy
+    return copy.deepcopy(_registry_cache[1])
 
 def get_available_specs() -> List[str]:
     """Returns a list of available OpenAPI specs that haven't been initialized"""
@@ -73,4 +89,47 @@ def mark_api_as_initialized(api_name: str) -> bool:
     with open(REGISTRY_FILE, "w") as f:
         json.dump(registry_data, f, indent=2)
     
-    return True
\ No newline at end of file
+    return True
+
+def get_spec_versions(api_name: str) -> Dict:
+    """Returns the version history of an API's spec: versions, current_version and deployed_version"""
+    api_data = get_registry_data().get("apis", {}).get(api_name, {})
+    return {
+        "versions": api_data.get("versions", []),
+        "current_version": api_data.get("current_version"),
+        "deployed_version": api_data.get("deployed_version")
+    }
+
+def record_spec_version(api_name: str, version: str) -> bool:
+    """Records a spec version as the API's current version. Returns True if successful."""
+    registry_data = get_registry_data()
+    
+    if api_name not in registry_data.get("apis", {}):
+        return False
+    
+    api_data = registry_data["apis"][api_name]
+    versions = api_data.setdefault("versions", [])
+    if version in versions and api_data.get("current_version") == version:
+        return True  # Already recorded, avoid rewriting the registry
+    if version not in versions:
+        versions.append(version)
+    api_data["current_version"] = version
+    
+    with open(REGISTRY_FILE, "w") as f:
+        json.dump(registry_data, f, indent=2)
+    
+    return True
+
+def mark_spec_deployed(api_name: str, version: str) -> bool:
+    """Marks a spec version as the one last uploaded to storage. Returns True if successful."""
+    registry_data = get_registry_data()
+    
+    if api_name not in registry_data.get("apis", {}):
+        return False
+    
+    registry_data["apis"][api_name]["deployed_version"] = version
+    
+    with open(REGISTRY_FILE, "w") as f:
+        json.dump(registry_data, f, indent=2)
+    
+    return True
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import mmap
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_DIR = Path(__file__).parent / "generated_apis" / "cassettes"
+
+MISS_POLICIES = ("fail", "passthrough")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+def request_key(endpoint: str, params: Dict) -> str:
+    """Build the canonical key for a request (order of params does not matter)"""
+    canonical = json.dumps(
+        {"endpoint": endpoint, "params": {k: str(v) for k, v in params.items()}},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Append-only store of recorded request/response pairs for a single API.
+
+    Each record is one line: ``<key> <compact json>``. Lookups go through an
+    index of line offsets built once over a memory-mapped view of the file;
+    when a key is recorded more than once the latest record wins.
+
+    A cassette can be shared between threads. Only the index, the mapping and
+    the file append are locked, never the request that produced a response.
+    """
+
+    def __init__(self, api_name: str, mode: str = "replay", on_miss: str = "fail",
+                 cassette_dir: Path = CASSETTE_DIR):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        if on_miss not in MISS_POLICIES:
+            raise ValueError(f"Invalid miss policy: {on_miss}. Must be one of: {', '.join(MISS_POLICIES)}")
+
+        self.api_name = api_name
+        self.mode = mode
+        self.on_miss = on_miss
+        self.path = Path(cassette_dir) / f"{api_name}.cassette"
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        self._lock = threading.RLock()
+
+    def _map(self):
+        """(Re)map the cassette file for reading"""
+        self._unmap()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _build_index(self):
+        """Scan the mapped file once and remember where each key's record lives"""
+        self._index = {}
+        self._map()
+        if self._mmap is None:
+            return
+
+        mm = self._mmap
+        start = 0
+        size = len(mm)
+        while start < size:
+            end = mm.find(b"\n", start)
+            if end == -1:
+                # Ignore a trailing partial record left by an interrupted write
+                break
+            sep = mm.find(b" ", start, end)
+            if sep != -1:
+                key = mm[start:sep].decode("ascii")
+                self._index[key] = (sep + 1, end)
+            start = end + 1
+
+    def load(self):
+        """Build the lookup index now instead of on the first lookup"""
+        with self._lock:
+            self._build_index()
+
+    def lookup(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """Return the recorded entry for a request, or None if it was never recorded"""
+        key = request_key(endpoint, params)
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+
+            location = self._index.get(key)
+            if location is None:
+                return None
+
+            start, end = location
+            if self._mmap is None or end > len(self._mmap):
+                # Records appended since the file was last mapped
+                self._map()
+            raw = self._mmap[start:end]
+        return json.loads(raw)
+
+    def replay(self, endpoint: str, params: Dict) -> Optional[requests.Response]:
+        """Build a Response from the recorded entry for a request, or None on a miss"""
+        entry = self.lookup(endpoint, params)
+        if entry is None:
+            return None
+
+        response = requests.models.Response()
+        response.status_code = entry["status"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response._content_consumed = True
+        return response
+
+    def record(self, endpoint: str, params: Dict, response: requests.Response):
+        """Append a request/response pair to the cassette"""
+        key = request_key(endpoint, params)
+        entry = {
+            "endpoint": endpoint,
+            "params": params,
+            "status": response.status_code,
+            "url": response.url,
+            "headers": {"Content-Type": response.headers.get("Content-Type", "application/json")},
+            "body": response.content.decode("utf-8", errors="replace")
+        }
+        line = key.encode("ascii") + b" " + json.dumps(entry, separators=(",", ":")).encode("utf-8")
+
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(line + b"\n")
+                f.flush()
+                # Other processes may append concurrently, so take the offset after writing
+                offset = f.tell() - len(line) - 1
+
+            start = offset + len(key) + 1
+            self._index[key] = (start, offset + len(line))
+
+    def close(self):
+        with self._lock:
+            self._unmap()
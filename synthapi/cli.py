@@ -16,7 +16,12 @@ from .api_registry import (
     mark_api_as_initialized,
     clean_registry
 )
-from .api_client import get
+from .api_client import get, load_api_spec, save_api_spec
+from .spec_versions import compare_with_deployed, save_spec_version, short_version
+from .compression import describe_savings, get_spec_compression
+from .cassette import MISS_POLICIES
+from .mock_server import MockServerPool
+from .daemon import get_socket_path, run_daemon, send_request
 
 # Initialize typer app
 app = typer.Typer(name="synthapi")
@@ -98,10 +103,11 @@ class RequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(b"Error: No API name specified")
                 return
 
-            # Save the API specification JSON
-            api_file_path = GENERATED_API_DIR / f"{api_name}.json"
-            with open(api_file_path, "w") as f:
-                json.dump(data, f, indent=2)
+            # Save the API specification JSON (compact, compressed if configured)
+            compression = get_spec_compression()
+            written, indented = save_api_spec(api_name, data, GENERATED_API_DIR, compression)
+            save_spec_version(api_name, data)
+            print(f"✓ Saved {api_name}.json ({compression or 'compact JSON'}, {describe_savings(indented, written)})")
 
             self.send_response(200)
             self._send_cors_headers()
@@ -213,7 +219,9 @@ def generate(
 @app.command()
 def init(
     name=typer.Option(..., "--name", "-n", help="Project name (must exist in registry)"),
-    data=typer.Option(None, "--data", "-d", help="Context data for LLM (optional)")
+    data=typer.Option(None, "--data", "-d", help="Context data for LLM (optional)"),
+    storage=typer.Option(None, "--storage", "-s", help="Storage backend: s3 or local (defaults to SYNTHAPI_STORAGE, then s3)"),
+    compress=typer.Option(None, "--compress", "-c", help="Compress uploads: gzip or zstd (defaults to SYNTHAPI_UPLOAD_COMPRESSION)")
 ):
     """Initialize an API by sending its spec to S3 and setting up the database"""
     # Get all specs and their status
@@ -241,7 +249,7 @@ def init(
         raise typer.Exit(1)
 
     try:
-        s3_handler = S3Handler()
+        s3_handler = S3Handler(storage=storage, compression=compress)
         api_spec_path = GENERATED_API_DIR / f"{name}.json"
         data_file_path = GENERATED_API_DIR / f"{name}_data.txt"
 
@@ -263,7 +271,10 @@ def init(
                 print(f"✅ Successfully initialized {name}:")
                 print(f"  • Uploaded {name}.json to schemas/")
                 print(f"  • Uploaded {name}_data.txt to raw/")
-                print(f"  • Initialized database")
+                if s3_handler.uses_database:
+                    print(f"  • Initialized database")
+                else:
+                    print(f"  • Skipped database initialization (local storage)")
                 print(f"  • Marked as initialized in registry")
                 
                 # Show remaining available APIs
@@ -287,9 +298,12 @@ def init(
 @app.command()
 def extend(
     name: str = typer.Option(..., "--name", "-n", help="API name to extend"),
-    data: str = typer.Option(..., "--data", "-d", help="Data prompt for extending the API"),
+    data: str = typer.Option(None, "--data", "-d", help="Data prompt for extending the API (optional if the spec changed)"),
+    storage: str = typer.Option(None, "--storage", "-s", help="Storage backend: s3 or local (defaults to SYNTHAPI_STORAGE, then s3)"),
+    compress: str = typer.Option(None, "--compress", "-c", help="Compress uploads: gzip or zstd (defaults to SYNTHAPI_UPLOAD_COMPRESSION)"),
+    full: bool = typer.Option(False, "--full", help="Upload the spec and regenerate every endpoint, even if unchanged"),
 ):
-    """Extend an API's data by uploading a new data prompt and updating the database"""
+    """Extend an API's data and sync spec changes, regenerating only the endpoints that changed"""
     try:
         # Check if API exists and is initialized
         all_specs = get_all_specs()
@@ -301,31 +315,79 @@ def extend(
             print(f"❌ Error: '{name}' has not been initialized yet.")
             return
 
-        # Create and upload data file
-        s3_handler = S3Handler()
-        data_file_path = GENERATED_API_DIR / f"{name}_data.txt"
+        s3_handler = S3Handler(storage=storage, compression=compress)
         
-        # Write the data prompt to a file
-        with open(data_file_path, "w") as f:
-            f.write(data)
-
-        # Upload the data file to S3
-        if s3_handler.upload_file(data_file_path, f"{name}_data.txt"):
-            # Initialize database with new data
-            if s3_handler.initialize_database(name):
-                print(f"✅ Successfully extended {name}:")
-                print(f"  • Uploaded new {name}_data.txt to raw/")
-                print(f"  • Updated database with new data")
-            else:
-                print("❌ Error: Failed to update database")
-                raise typer.Exit(1)
-        else:
-            print("❌ Error: Failed to upload data file")
+        data_file_path = None
+        if data:
+            # Write the data prompt to a file to upload
+            data_file_path = GENERATED_API_DIR / f"{name}_data.txt"
+            with open(data_file_path, "w") as f:
+                f.write(data)
+        
+        # Uploads the spec only if it changed since it was last deployed
+        result = s3_handler.extend_api(name, GENERATED_API_DIR / f"{name}.json", data_file_path, full=full)
+        if result is None:
+            print("❌ Error: Failed to extend API")
             raise typer.Exit(1)
+        
+        if result.up_to_date:
+            print(f"✓ {name} is up to date: the spec has not changed and no data prompt was given")
+            return
+
+        spec_diff = result.spec_diff
+        endpoints = result.endpoints
+        print(f"✅ Successfully extended {name}:")
+        if result.spec_changed:
+            print(f"  • Uploaded {name}.json to schemas/ ({len(spec_diff.added)} added, "
+                  f"{len(spec_diff.changed)} changed, {len(spec_diff.removed)} removed endpoints)")
+        if result.data_uploaded:
+            print(f"  • Uploaded new {name}_data.txt to raw/")
+        if endpoints != [] and not s3_handler.uses_database:
+            print(f"  • Skipped database update (local storage)")
+        elif endpoints is None:
+            print(f"  • Updated database for all endpoints")
+        elif endpoints:
+            print(f"  • Updated database for {len(endpoints)} changed endpoints: {', '.join(endpoints)}")
+        else:
+            print(f"  • No endpoint changes, database left as is")
 
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         raise typer.Exit(1)
+
+@app.command()
+def diff(
+    name=typer.Option(..., "--name", "-n", help="API name to compare")
+):
+    """Preview which endpoints changed since the spec was last uploaded"""
+    if name not in get_all_specs():
+        print(f"❌ Error: '{name}' is not in the registry.")
+        raise typer.Exit(1)
+    
+    spec = load_api_spec(name, GENERATED_API_DIR)
+    if not spec:
+        print(f"❌ Error: No generated API spec found for '{name}'.")
+        raise typer.Exit(1)
+    
+    deployed, current, spec_diff = compare_with_deployed(name, spec)
+    if deployed == current:
+        print(f"✓ No changes since deployed version {short_version(deployed)}")
+        return
+    
+    if deployed is None:
+        print(f"{name} has not been uploaded yet, version {short_version(current)} adds:")
+    else:
+        print(f"Changes in {name} from deployed version {short_version(deployed)} to {short_version(current)}:")
+    
+    for method, path in spec_diff.added:
+        print(f"  + {method} {path}")
+    for method, path in spec_diff.changed:
+        print(f"  ~ {method} {path}")
+    for method, path in spec_diff.removed:
+        print(f"  - {method} {path}")
+    if spec_diff.is_empty:
+        print("  No endpoint changes (only metadata differs)")
+    print(f"  {len(spec_diff.unchanged)} unchanged")
     
 @app.command()
 def list(
@@ -352,6 +414,59 @@ def list(
         for spec in specs:
             print(f"  • {spec}")
 
+@app.command()
+def serve(
+    name=typer.Option(..., "--name", "-n", help="Name of the API to serve"),
+    port: int = typer.Option(8080, "--port", "-p", help="Port to listen on"),
+    workers: int = typer.Option(None, "--workers", "-w", help="Number of worker processes (defaults to the number of CPUs)"),
+    on_miss=typer.Option("fail", "--on-miss", help="Cassette miss policy: fail or passthrough (request and record)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every request")
+):
+    """Serve an API locally from its spec and recorded cassette using pre-forked workers"""
+    if on_miss not in MISS_POLICIES:
+        print(f"❌ Error: Invalid --on-miss value. Must be one of: {', '.join(MISS_POLICIES)}")
+        raise typer.Exit(1)
+
+    workers = workers or os.cpu_count() or 1
+    pool = MockServerPool(name, port, workers, on_miss=on_miss, spec_dir=GENERATED_API_DIR, verbose=verbose)
+
+    print(f"Serving {name} at http://localhost:{port} with {workers} workers")
+    print(f"Watching {name}.json for changes, press Ctrl+C to stop")
+    try:
+        pool.serve()
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {str(e)}")
+        raise typer.Exit(1)
+    print("\nShutting down server...")
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    status: bool = typer.Option(False, "--status", help="Check whether a daemon is running")
+):
+    """Run a warm background daemon that answers get and list without a cold start"""
+    socket_path = get_socket_path()
+
+    if stop:
+        if send_request({"command": "stop"}, socket_path) is None:
+            print("No daemon is running")
+        else:
+            print("✅ Daemon stopped")
+        return
+
+    if status:
+        if send_request({"command": "status"}, socket_path) is None:
+            print("No daemon is running")
+        else:
+            print(f"✓ Daemon running on {socket_path}")
+        return
+
+    try:
+        run_daemon(socket_path)
+    except (RuntimeError, OSError) as e:
+        print(f"❌ Error: {str(e)}")
+        raise typer.Exit(1)
+
 # Add the get command
 app.command()(get)
 
@@ -0,0 +1,219 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .api_client import compile_routes, load_api_spec, make_request, validate_parameters
+from .api_registry import get_all_specs, mark_api_as_initialized
+from .cassette import Cassette
+from .response_validation import get_response_validator
+from .s3_handler import ExtendResult, S3Handler
+
+GENERATED_API_DIR = Path(__file__).parent / "generated_apis"
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class SynthAPIError(Exception):
+    """Raised when a SynthClient call cannot be made or fails"""
+
+
+class SynthClient:
+    """
+    In-process client for a single registered API.
+
+    Keeps one pooled HTTP session and the parsed spec for the lifetime of the
+    client, so test suites can issue many calls without spawning the CLI.
+
+    Example:
+        with SynthClient("yelp") as client:
+            businesses = client.get("/v3/businesses/search", location="NYC").json()
+            responses = client.get_many([("/v3/categories", {}), ...])
+    """
+
+    def __init__(self, api_name: str, generated_api_dir: Path = GENERATED_API_DIR,
+                 record: bool = False, replay: bool = False, on_miss: str = "fail",
+                 storage: Optional[str] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 validate_responses: bool = False):
+        """
+        Args:
+            api_name (str): Name of the API to query
+            generated_api_dir (Path): Directory holding NAME.json specs
+            record (bool): Record every response into the API's cassette
+            replay (bool): Answer from the API's cassette instead of the network
+            on_miss (str): Replay miss policy, "fail" or "passthrough"
+            storage (str): Storage backend used by init_api/extend_api
+            max_workers (int): Concurrency for get_many and the async methods
+            validate_responses (bool): Check JSON responses against the endpoint's
+                response schema and raise SynthAPIError on a mismatch
+        """
+        if record and replay:
+            raise ValueError("record and replay cannot be used together")
+
+        self.api_name = api_name
+        self.generated_api_dir = Path(generated_api_dir)
+        self.storage = storage
+        self.max_workers = max_workers
+        self.validate_responses = validate_responses
+
+        self.cassette = None
+        if record or replay:
+            self.cassette = Cassette(api_name, mode="record" if record else "replay", on_miss=on_miss)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._spec: Optional[Dict] = None
+        self._routes: Optional[Dict] = None
+        self._spec_stamp = None
+        self._s3_handler: Optional[S3Handler] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the HTTP session, worker threads and cassette"""
+        self.session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.cassette is not None:
+            self.cassette.close()
+
+    @property
+    def spec_path(self) -> Path:
+        return self.generated_api_dir / f"{self.api_name}.json"
+
+    def _get_routes(self) -> Dict:
+        """Return the compiled spec, re-reading it only when the file has changed"""
+        try:
+            stat = self.spec_path.stat()
+        except FileNotFoundError:
+            raise SynthAPIError(f"No specification found for API '{self.api_name}'")
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._routes is None or stamp != self._spec_stamp:
+            spec = load_api_spec(self.api_name, self.generated_api_dir)
+            self._spec = spec or {}
+            self._routes = compile_routes(self._spec)
+            self._spec_stamp = stamp
+        return self._routes
+
+    def get(self, endpoint: str, **params) -> requests.Response:
+        """Make a validated GET request to an endpoint of the API"""
+        endpoint_spec = self._get_routes().get(endpoint)
+        if not endpoint_spec:
+            raise SynthAPIError(f"No GET method found for endpoint '{endpoint}'")
+
+        params = {name: str(value) for name, value in params.items() if value is not None}
+        is_valid, error = validate_parameters(params, endpoint_spec)
+        if not is_valid:
+            raise SynthAPIError(error)
+
+        try:
+            # The cassette locks only its own index and file, not the request itself
+            response = make_request(self.api_name, endpoint, params, cassette=self.cassette, session=self.session)
+        except (requests.RequestException, LookupError) as e:
+            raise SynthAPIError(f"Error making request: {str(e)}") from e
+
+        if self.validate_responses:
+            self._validate_response(endpoint, response)
+        return response
+
+    def _validate_response(self, endpoint: str, response: requests.Response):
+        validator = get_response_validator(self._spec, endpoint, response.status_code)
+        if validator is None:
+            return
+        try:
+            body = response.json()
+        except ValueError:
+            raise SynthAPIError(f"Response from {endpoint} is not JSON")
+        validator.check_document(body)
+        if not validator.ok:
+            raise SynthAPIError(f"Response from {endpoint} does not match schema: {validator.errors[0]}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def get_many(self, calls: Iterable[Tuple[str, Dict]]) -> List[requests.Response]:
+        """
+        Make several GET requests concurrently over the shared session
+
+        Args:
+            calls: (endpoint, params) pairs
+
+        Returns:
+            List of responses in the same order as calls
+        """
+        executor = self._get_executor()
+        futures = [executor.submit(self.get, endpoint, **params) for endpoint, params in calls]
+        return [future.result() for future in futures]
+
+    async def aget(self, endpoint: str, **params) -> requests.Response:
+        """Async version of get, run on the client's worker threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), lambda: self.get(endpoint, **params))
+
+    async def aget_many(self, calls: Iterable[Tuple[str, Dict]]) -> List[requests.Response]:
+        """Async version of get_many"""
+        return await asyncio.gather(*(self.aget(endpoint, **params) for endpoint, params in calls))
+
+    def _get_s3_handler(self) -> S3Handler:
+        if self._s3_handler is None:
+            self._s3_handler = S3Handler(storage=self.storage)
+        return self._s3_handler
+
+    def init_api(self, data: Optional[str] = None):
+        """Upload the API's spec and context data, initialize its database and mark it initialized"""
+        all_specs = get_all_specs()
+        if self.api_name not in all_specs:
+            raise SynthAPIError(f"'{self.api_name}' is not in the registry.")
+        if all_specs[self.api_name]:
+            raise SynthAPIError(f"'{self.api_name}' has already been initialized.")
+        if not self.spec_path.exists():
+            raise SynthAPIError(f"No generated API spec found for '{self.api_name}'.")
+
+        data_file_path = self.generated_api_dir / f"{self.api_name}_data.txt"
+        with open(data_file_path, "w") as f:
+            f.write(data if data else "")
+
+        if not self._get_s3_handler().init_api(self.api_name, self.spec_path, data_file_path):
+            raise SynthAPIError("Failed to initialize API")
+        mark_api_as_initialized(self.api_name)
+
+    def extend_api(self, data: Optional[str] = None, full: bool = False) -> ExtendResult:
+        """
+        Sync the API with its spec and an optional new data prompt, like the
+        extend command: the spec is uploaded only if it changed since it was
+        last deployed, and a spec change on its own regenerates only the
+        endpoints it touched
+
+        Args:
+            data (str): New data prompt, regenerates every endpoint
+            full (bool): Upload the spec and regenerate everything even if unchanged
+        """
+        all_specs = get_all_specs()
+        if not all_specs.get(self.api_name):
+            raise SynthAPIError(f"'{self.api_name}' has not been initialized yet.")
+
+        data_file_path = None
+        if data:
+            data_file_path = self.generated_api_dir / f"{self.api_name}_data.txt"
+            with open(data_file_path, "w") as f:
+                f.write(data)
+
+        result = self._get_s3_handler().extend_api(self.api_name, self.spec_path, data_file_path, full=full)
+        if result is None:
+            raise SynthAPIError("Failed to extend API")
+        return result
@@ -0,0 +1,90 @@
+import gzip
+import io
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional, gzip is always available
+    zstandard = None
+
+COMPRESSION_METHODS = ("gzip", "zstd")
+
+# Leading bytes of each format, used to detect compressed content
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def check_method(method: Optional[str]) -> Optional[str]:
+    """Validate a compression method name, returning None for no compression"""
+    if not method or method == "none":
+        return None
+    if method not in COMPRESSION_METHODS:
+        raise ValueError(f"Invalid compression method: {method}. Must be one of: {', '.join(COMPRESSION_METHODS)}")
+    if method == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install synthapi[compression])")
+    return method
+
+
+def detect_encoding(data: bytes) -> Optional[str]:
+    """Return the compression method of data based on its magic bytes, or None if uncompressed"""
+    if data.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if data.startswith(_ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def is_compressed_file(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return detect_encoding(f.read(4)) is not None
+
+
+def compress(data: bytes, method: str) -> bytes:
+    if method == "gzip":
+        # mtime=0 keeps output deterministic for identical input. GzipFile is
+        # used because gzip.compress() only accepts mtime from Python 3.8.
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6, mtime=0) as f:
+            f.write(data)
+        return buf.getvalue()
+    if method == "zstd":
+        check_method(method)
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    raise ValueError(f"Invalid compression method: {method}")
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress gzip or zstd data, returning anything else unchanged"""
+    encoding = detect_encoding(data)
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        check_method(encoding)
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=1 << 31)
+    return data
+
+
+def get_spec_compression() -> Optional[str]:
+    """Compression for specs saved to disk, from SYNTHAPI_SPEC_COMPRESSION (default none)"""
+    return check_method(os.getenv('SYNTHAPI_SPEC_COMPRESSION'))
+
+
+def get_upload_compression() -> Optional[str]:
+    """Compression for uploads, from SYNTHAPI_UPLOAD_COMPRESSION (default none)"""
+    return check_method(os.getenv('SYNTHAPI_UPLOAD_COMPRESSION'))
+
+
+def format_size(num_bytes: int) -> str:
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def describe_savings(original: int, compressed: int) -> str:
+    """e.g. '12.0 KB → 2.1 KB, saved 82%'"""
+    saved = 100 * (original - compressed) / original if original else 0
+    return f"{format_size(original)} → {format_size(compressed)}, saved {saved:.0f}%"
@@ -0,0 +1,256 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+# Keep this module's top-level imports to the standard library: main() runs on
+# every invocation and must be able to forward to the daemon before importing
+# typer, requests or openai.
+
+# Read-only commands that a running daemon answers on behalf of the CLI
+FORWARDED_COMMANDS = ("get", "list")
+
+
+def get_socket_path() -> Path:
+    """Unix socket path of the daemon, per user unless SYNTHAPI_DAEMON_SOCKET is set"""
+    path = os.getenv('SYNTHAPI_DAEMON_SOCKET')
+    if path:
+        return Path(path)
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return Path(tempfile.gettempdir()) / f"synthapi-{uid}.sock"
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if it is not running"""
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send_request(request: dict, socket_path: Optional[Path] = None) -> Optional[int]:
+    """
+    Send a request to the daemon, relaying its output as it arrives
+
+    Returns:
+        The command's exit code, or None if no daemon is listening
+    """
+    sock = _connect(socket_path or get_socket_path())
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+
+    # The daemon went away mid-command
+    return 1
+
+
+def main():
+    """Entry point of the synthapi script: use a running daemon when possible, else run in-process"""
+    args = sys.argv[1:]
+    if args and args[0] in FORWARDED_COMMANDS and not os.getenv('SYNTHAPI_NO_DAEMON'):
+        exit_code = send_request({"argv": args})
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .cli import app
+    app()
+
+
+class _MessageStream:
+    """File-like object that forwards writes to the client as JSON messages"""
+
+    def __init__(self, wfile, kind: str):
+        self.wfile = wfile
+        self.kind = kind
+
+    encoding = "utf-8"
+
+    def write(self, text: str) -> int:
+        if text:
+            self.wfile.write(json.dumps({self.kind: text}).encode("utf-8") + b"\n")
+        return len(text)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _ThreadOutput:
+    """
+    Stand-in for sys.stdout/sys.stderr that sends each thread's writes to the
+    stream set for that thread, so concurrent commands capture their own output
+    """
+
+    encoding = "utf-8"
+    errors = "replace"
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    @property
+    def target(self):
+        return getattr(self._local, "stream", None) or self.default
+
+    def set_stream(self, stream):
+        self._local.stream = stream
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # Reject bytes like a text stream does, otherwise click wraps this
+            # object in a TextIOWrapper that every thread would then share
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+
+def run_daemon(socket_path: Optional[Path] = None):
+    """
+    Serve forwarded CLI commands on a Unix socket until stopped.
+
+    Imports, the CLI command tree, the registry, parsed specs and the pooled
+    HTTP session all stay loaded between commands. Each connection is served
+    on its own thread, so a slow command (e.g. a get waiting on the network)
+    does not hold up the others.
+    """
+    import socketserver
+
+    import typer
+
+    from .api_client import get_session, load_api_spec
+    from .api_registry import GENERATED_API_DIR, get_all_specs
+    from .cli import app
+
+    socket_path = socket_path or get_socket_path()
+    command = typer.main.get_command(app)
+
+    def run_command(argv: List[str]) -> int:
+        try:
+            result = command.main(argv, prog_name="synthapi", standalone_mode=False)
+            return result if isinstance(result, int) else 0
+        except typer.Abort:
+            print("Aborted!", file=sys.stderr)
+            return 1
+        except typer.Exit as e:
+            return e.exit_code
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            # Usage errors (click's ClickException) know how to report themselves
+            if hasattr(e, "show") and hasattr(e, "exit_code"):
+                e.show()
+                return e.exit_code
+            print(f"❌ Error: {str(e)}")
+            return 1
+
+    class DaemonRequestHandler(socketserver.StreamRequestHandler):
+        def _send(self, message: dict):
+            self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                return
+
+            if request.get("command") == "stop":
+                self.server.should_stop = True
+                self._send({"exit": 0})
+                return
+            if request.get("command") == "status":
+                self._send({"exit": 0})
+                return
+
+            argv = request.get("argv") or []
+            if not argv or argv[0] not in FORWARDED_COMMANDS:
+                self._send({"err": f"Command not handled by the daemon: {' '.join(argv)}\n"})
+                self._send({"exit": 2})
+                return
+
+            stdout.set_stream(_MessageStream(self.wfile, "out"))
+            stderr.set_stream(_MessageStream(self.wfile, "err"))
+            try:
+                exit_code = run_command(argv)
+            finally:
+                stdout.set_stream(None)
+                stderr.set_stream(None)
+            self._send({"exit": exit_code})
+
+    class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        timeout = 0.5
+        # server_close() waits for commands that are still running
+        daemon_threads = False
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.should_stop = False
+
+    existing = _connect(socket_path)
+    if existing is not None:
+        existing.close()
+        raise RuntimeError(f"A daemon is already listening on {socket_path}")
+    if socket_path.exists():
+        # Left behind by a daemon that did not shut down cleanly
+        socket_path.unlink()
+
+    # Warm up everything the forwarded commands touch
+    get_session()
+    for name in get_all_specs():
+        try:
+            load_api_spec(name, GENERATED_API_DIR)
+        except ValueError:
+            pass
+
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(str(socket_path), DaemonRequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    # Output from the daemon's own thread still goes to the terminal
+    stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+    sys.stdout, sys.stderr = stdout, stderr
+
+    print(f"synthapi daemon listening on {socket_path}")
+    print("Press Ctrl+C or run 'synthapi daemon --stop' to stop")
+    try:
+        while not server.should_stop:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        sys.stdout, sys.stderr = stdout.default, stderr.default
+        if socket_path.exists():
+            socket_path.unlink()
@@ -0,0 +1,285 @@
+import http.server
+import json
+import os
+import signal
+import socket
+import socketserver
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from .api_client import compile_routes, load_api_spec, make_request, validate_parameters
+from .cassette import Cassette, CassetteMiss
+
+GENERATED_API_DIR = Path(__file__).parent / "generated_apis"
+
+RELOAD_POLL_INTERVAL = 1.0
+
+
+class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answers GET requests for a single API from its spec and cassette"""
+
+    def log_message(self, format, *args):
+        # Per-request logging to stderr would dominate the cost of a cassette hit
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path
+        params = dict(parse_qsl(url.query))
+
+        endpoint_spec = self.server.routes.get(endpoint)
+        if endpoint_spec is None:
+            self._send_error(404, f"No GET method found for endpoint '{endpoint}'")
+            return
+
+        is_valid, error = validate_parameters(params, endpoint_spec)
+        if not is_valid:
+            self._send_error(400, error)
+            return
+
+        try:
+            response = make_request(self.server.api_name, endpoint, params, cassette=self.server.cassette)
+        except CassetteMiss as e:
+            self._send_error(404, str(e))
+            return
+        except requests.RequestException as e:
+            self._send_error(502, f"Error making request: {str(e)}")
+            return
+
+        self._send(
+            response.status_code,
+            response.content,
+            response.headers.get("Content-Type", "application/json")
+        )
+
+
+class MockHTTPServer(socketserver.TCPServer):
+    allow_reuse_address = True
+    # handle_request() returns after this many seconds so workers can notice a stop request
+    timeout = 0.5
+
+    def __init__(self, address, api_name: str, routes: Dict, cassette: Cassette,
+                 reuse_port: bool = False, verbose: bool = False):
+        self.api_name = api_name
+        self.routes = routes
+        self.cassette = cassette
+        self.reuse_port = reuse_port
+        self.verbose = verbose
+        self.should_stop = False
+        super().__init__(address, MockRequestHandler)
+
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def run(self):
+        """Serve one request at a time until asked to stop, finishing the current request first"""
+        # Another worker may accept a connection between select() and accept(),
+        # a non-blocking listener makes that a no-op instead of a stuck worker
+        self.socket.setblocking(False)
+        while not self.should_stop:
+            self.handle_request()
+
+
+class MockServerPool:
+    """
+    Pre-forked pool of mock server workers for one API.
+
+    The spec and cassette index are loaded once in the parent before forking,
+    so workers share them copy-on-write (the cassette itself is an mmap). When
+    SO_REUSEPORT is available each worker slot has its own listening socket and
+    the kernel balances connections between them; otherwise all workers accept
+    on one socket. The parent keeps the listening sockets open for its whole
+    lifetime. When generated_apis/NAME.json changes, a new generation of
+    workers is started on the same sockets before the old one is asked to
+    stop, so connections queued during a reload are served by the new workers
+    instead of being reset.
+    """
+
+    def __init__(self, api_name: str, port: int, workers: int, on_miss: str = "fail",
+                 spec_dir: Path = GENERATED_API_DIR, verbose: bool = False):
+        self.api_name = api_name
+        self.port = port
+        self.workers = max(1, workers)
+        self.on_miss = on_miss
+        self.spec_dir = spec_dir
+        self.spec_path = spec_dir / f"{api_name}.json"
+        self.verbose = verbose
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self.servers: List[MockHTTPServer] = []
+        # Worker pid -> index of the listening socket it serves
+        self.pids: Dict[int, int] = {}
+        self.stopping = False
+        self.routes: Dict = {}
+        self.cassette: Optional[Cassette] = None
+        self.spec_stamp = None
+
+    def _spec_stamp(self):
+        stat = self.spec_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        """Load and compile the spec and open the cassette. Raises ValueError if the spec is missing or invalid."""
+        stamp = self._spec_stamp() if self.spec_path.exists() else None
+        try:
+            spec = load_api_spec(self.api_name, self.spec_dir)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid specification for API '{self.api_name}': {str(e)}")
+        if not spec:
+            raise ValueError(f"No specification found for API '{self.api_name}'")
+
+        cassette = Cassette(self.api_name, mode="replay", on_miss=self.on_miss)
+        cassette.load()
+
+        if self.cassette is not None:
+            self.cassette.close()
+        self.routes = compile_routes(spec)
+        self.cassette = cassette
+        self.spec_stamp = stamp
+
+    def _make_server(self) -> MockHTTPServer:
+        return MockHTTPServer(
+            ("", self.port), self.api_name, self.routes, self.cassette,
+            reuse_port=self.reuse_port, verbose=self.verbose
+        )
+
+    def _check_port_free(self):
+        """
+        Fail if anything already listens on the port. SO_REUSEPORT would
+        otherwise let a second server (e.g. another `synthapi serve` on the
+        same port) bind alongside this one and take part of the traffic.
+        SO_REUSEADDR alone still ignores connections left in TIME_WAIT.
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                probe.bind(("", self.port))
+                probe.listen(1)
+            except OSError:
+                raise OSError(f"Port {self.port} is already in use")
+
+    def _open_servers(self):
+        if not self.servers:
+            self._check_port_free()
+        count = self.workers if self.reuse_port else 1
+        while len(self.servers) < count:
+            self.servers.append(self._make_server())
+
+    def _spawn_worker(self, slot: int) -> int:
+        server = self.servers[slot % len(self.servers)]
+        server.routes = self.routes
+        server.cassette = self.cassette
+
+        # Keep signals pending until the child has replaced the parent's handlers
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+        try:
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                signal.signal(signal.SIGTERM, lambda signum, frame: setattr(server, "should_stop", True))
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM})
+                try:
+                    server.run()
+                finally:
+                    os._exit(0)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM})
+        return pid
+
+    def _spawn_generation(self) -> Dict[int, int]:
+        return {self._spawn_worker(slot): slot for slot in range(self.workers)}
+
+    def _stop_workers(self, pids: Iterable[int]):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+    def _reap_and_respawn(self):
+        """Replace workers that exited unexpectedly"""
+        while self.pids:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.pids:
+                print(f"⚠️ Worker {pid} exited, starting a replacement")
+                slot = self.pids.pop(pid)
+                self.pids[self._spawn_worker(slot)] = slot
+
+    def _check_reload(self):
+        if not self.spec_path.exists() or self._spec_stamp() == self.spec_stamp:
+            return
+        try:
+            self.load()
+        except ValueError as e:
+            # Probably caught mid-save, try again on the next poll
+            print(f"⚠️ Not reloading: {str(e)}")
+            return
+
+        old_pids = self.pids
+        self.pids = self._spawn_generation()
+        self._stop_workers(old_pids)
+        print(f"↻ Reloaded {self.spec_path.name} ({len(self.routes)} endpoints)")
+
+    def serve(self):
+        """Start the workers and supervise them until interrupted"""
+        self.load()
+
+        if not hasattr(os, "fork"):
+            # No fork on this platform, serve from a single process without reload
+            server = self._make_server()
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+            return
+
+        # SIGTERM (e.g. from a process manager) gets the same cleanup as Ctrl+C
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "stopping", True))
+
+        self._open_servers()
+        self.pids = self._spawn_generation()
+        try:
+            while not self.stopping:
+                time.sleep(RELOAD_POLL_INTERVAL)
+                if self.stopping:
+                    break
+                self._reap_and_respawn()
+                self._check_reload()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pids, self.pids = self.pids, {}
+            self._stop_workers(pids)
+            for server in self.servers:
+                server.server_close()
+            self.servers = []
+            if self.cassette is not None:
+                self.cassette.close()
@@ -1,11 +1,54 @@
 import os
 import json
+import time
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from openai import OpenAI
 
 load_dotenv()
 
+# Tried first for every parse; the accurate model is only used when the fast
+# model's result has validation warnings or the call fails
+FAST_MODEL = os.getenv('SYNTHAPI_PARSER_FAST_MODEL', 'gpt-4o-mini')
+ACCURATE_MODEL = os.getenv('SYNTHAPI_PARSER_MODEL', 'gpt-4o')
+
+# Structured output schema, so replies always parse. Strict mode needs an
+# object at the root and every property listed as required (nullable instead
+# of optional).
+PARAMETERS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "parameters": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "type": {"type": "string", "enum": ["string", "number", "integer", "boolean", "array"]},
+                    "required": {"type": "boolean"},
+                    "description": {"type": "string"},
+                    "constraints": {
+                        "type": "object",
+                        "properties": {
+                            "min": {"type": ["number", "null"]},
+                            "max": {"type": ["number", "null"]},
+                            "default": {"type": ["string", "number", "boolean", "null"]},
+                            "enum": {"type": ["array", "null"], "items": {"type": "string"}},
+                            "conditional_requirement": {"type": ["string", "null"]}
+                        },
+                        "required": ["min", "max", "default", "enum", "conditional_requirement"],
+                        "additionalProperties": False
+                    }
+                },
+                "required": ["name", "type", "required", "description", "constraints"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["parameters"],
+    "additionalProperties": False
+}
+
 class DocParser:
     def __init__(self):
         api_key = os.getenv('OPENAI_API_KEY')
@@ -34,74 +77,98 @@ Input Documentation:
 
 Endpoint: {method} {path}
 
-Return a JSON array of parameters with this structure:
-[
-  {{
-    "name": string,
-    "type": "string" | "number" | "integer" | "boolean" | "array",
-    "required": boolean,
-    "description": string,
-    "constraints": {{
-      "min": number | null,
-      "max": number | null,
-      "default": any | null,
-      "enum": array | null,
-      "conditional_requirement": string | null
-    }}
-  }}
-]
+Use null for constraints that do not apply. Be precise and maintain any markdown formatting in descriptions."""
 
-Be precise and maintain any markdown formatting in descriptions."""
+    def _request_parameters(self, model: str, documentation: str, method: str, path: str) -> List[Dict[str, Any]]:
+        """Ask one model for the parameters and return them cleaned"""
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a precise API documentation parser. Extract parameter information from the documentation."
+                },
+                {
+                    "role": "user",
+                    "content": self.create_prompt(documentation, method, path)
+                }
+            ],
+            temperature=0.1,  # Low temperature for consistent results
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "parameters", "strict": True, "schema": PARAMETERS_SCHEMA}
+            }
+        )
+        latency = time.perf_counter() - start
+        
+        usage = response.usage
+        prompt_tokens = usage.prompt_tokens if usage else 0
+        completion_tokens = usage.completion_tokens if usage else 0
+        print(f"{model}: {latency:.2f}s, {prompt_tokens} prompt + {completion_tokens} completion tokens")
+        
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise ValueError(f"Model refused to parse documentation: {message.refusal}")
+        
+        # Extract and parse response
+        parsed_data = json.loads(message.content)
+        
+        # Handle both list and dict responses
+        parameters = parsed_data if isinstance(parsed_data, list) else parsed_data.get('parameters', [])
+        cleaned_parameters = []
+        
+        for param in parameters:
+            cleaned_param = self._clean_parameter(param)
+            if cleaned_param["name"]:  # Only include if name exists
+                cleaned_parameters.append(cleaned_param)
+        
+        return cleaned_parameters
 
     def parse_documentation(self, documentation: str, method: str, path: str) -> List[Dict[str, Any]]:
-        """Parse API documentation into structured parameter data"""
-        try:
-            # Clean and normalize input
-            documentation = '\n'.join(
-                line.strip() for line in documentation.splitlines() if line.strip()
-            )
-            
-            # Request GPT-4 analysis
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a precise API documentation parser. Extract parameter information and return it as valid JSON only, with no additional text."
-                    },
-                    {
-                        "role": "user",
-                        "content": self.create_prompt(documentation, method, path)
-                    }
-                ],
-                temperature=0.1  # Low temperature for consistent results
-            )
-            
-            # Extract and parse response
-            content = response.choices[0].message.content
-            parsed_data = json.loads(content)
-            
-            # Handle both list and dict responses
-            parameters = parsed_data if isinstance(parsed_data, list) else parsed_data.get('parameters', [])
-            cleaned_parameters = []
-            
-            for param in parameters:
-                cleaned_param = self._clean_parameter(param)
-                if cleaned_param["name"]:  # Only include if name exists
-                    cleaned_parameters.append(cleaned_param)
-            
-            # Check for warnings
-            warnings = self.validate_parameters(cleaned_parameters)
-            if warnings:
-                print("\nWarnings during parsing:")
-                for warning in warnings:
-                    print(f"- {warning}")
+        """
+        Parse API documentation into structured parameter data
+        
+        The fast model is tried first; the result is escalated to the accurate
+        model only when it has validation warnings or the call fails.
+        """
+        # Clean and normalize input
+        documentation = '\n'.join(
+            line.strip() for line in documentation.splitlines() if line.strip()
+        )
+        
+        models = [FAST_MODEL] if FAST_MODEL == ACCURATE_MODEL else [FAST_MODEL, ACCURATE_MODEL]
+        parameters: Optional[List[Dict[str, Any]]] = None
+        warnings: List[str] = []
+        
+        for index, model in enumerate(models):
+            is_last = index == len(models) - 1
+            try:
+                candidate = self._request_parameters(model, documentation, method, path)
+            except Exception as e:
+                print(f"Error parsing documentation with {model}: {str(e)}")
+                continue
             
-            return cleaned_parameters
+            candidate_warnings = self.validate_parameters(candidate)
+            # Keep the first result, or a later one that is at least as clean
+            if parameters is None or len(candidate_warnings) <= len(warnings):
+                parameters, warnings = candidate, candidate_warnings
             
-        except Exception as e:
-            print(f"Error parsing documentation: {str(e)}")
+            if not warnings:
+                break
+            if not is_last:
+                print(f"{len(warnings)} warnings from {model}, retrying with {models[index + 1]}")
+        
+        if parameters is None:
             return []
+        
+        # Check for warnings
+        if warnings:
+            print("\nWarnings during parsing:")
+            for warning in warnings:
+                print(f"- {warning}")
+        
+        return parameters
 
     def _clean_parameter(self, param: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and normalize a single parameter"""
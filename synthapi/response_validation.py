@@ -0,0 +1,445 @@
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+# A compiled validator takes a decoded JSON value and returns None when it
+# matches, or an error whose text starts with the location inside the value
+# (e.g. "[3].name: expected string, got int"). Locations are only built on
+# failure so valid values cost nothing extra.
+Validator = Callable[[object], Optional[str]]
+
+MAX_REPORTED_ERRORS = 10
+
+_PYTHON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+_JSON_TYPE_NAMES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+    type(None): "null",
+}
+
+
+def _accept(value) -> Optional[str]:
+    return None
+
+
+def resolve_ref(root: Dict, ref: str):
+    """
+    Resolve a local $ref (a JSON pointer such as "#/paths/~1users/get"),
+    undoing the ~1 (/) and ~0 (~) escapes. Returns None if it points nowhere.
+    """
+    if not ref.startswith("#/"):
+        return None
+    node = root
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, dict) and part in node:
+            node = node[part]
+        elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+            node = node[int(part)]
+        else:
+            return None
+    return node
+
+
+def _type_name(value) -> str:
+    return _JSON_TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+class _SchemaCompiler:
+    """Turns a JSON schema into nested validator closures, resolving local $refs"""
+
+    def __init__(self, root: Dict):
+        self.root = root
+        self.refs: Dict[str, Validator] = {}
+
+    def _resolve(self, ref: str) -> Dict:
+        node = resolve_ref(self.root, ref)
+        if node is None:
+            raise ValueError(f"Unresolvable $ref: {ref}")
+        return node
+
+    def _compile_ref(self, ref: str) -> Validator:
+        if ref not in self.refs:
+            # Register a forwarding stub first so recursive schemas terminate
+            target: List[Validator] = []
+            self.refs[ref] = lambda value: target[0](value)
+            target.append(self.compile(self._resolve(ref)))
+        return self.refs[ref]
+
+    def compile(self, schema: Dict) -> Validator:
+        if not isinstance(schema, dict) or not schema:
+            return _accept
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        checks: List[Validator] = []
+
+        schema_type = schema.get("type")
+        if schema_type:
+            checks.append(self._compile_type(schema_type))
+        if "enum" in schema:
+            checks.append(self._compile_enum(schema["enum"]))
+        if any(key in schema for key in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")):
+            checks.append(self._compile_range(schema))
+        if any(key in schema for key in ("minLength", "maxLength", "pattern")):
+            checks.append(self._compile_string(schema))
+        if any(key in schema for key in ("items", "minItems", "maxItems")):
+            checks.append(self._compile_array(schema))
+        if any(key in schema for key in ("properties", "required", "additionalProperties")):
+            checks.append(self._compile_object(schema))
+        for sub_schema in schema.get("allOf", []):
+            checks.append(self.compile(sub_schema))
+        if "anyOf" in schema:
+            checks.append(self._compile_any_of(schema["anyOf"], exactly_one=False))
+        if "oneOf" in schema:
+            checks.append(self._compile_any_of(schema["oneOf"], exactly_one=True))
+
+        if not checks:
+            validator = _accept
+        elif len(checks) == 1:
+            validator = checks[0]
+        else:
+            def validator(value, checks=tuple(checks)):
+                for check in checks:
+                    error = check(value)
+                    if error:
+                        return error
+                return None
+
+        if schema.get("nullable"):
+            inner = validator
+
+            def validator(value):
+                return None if value is None else inner(value)
+
+        return validator
+
+    def _compile_type(self, schema_type) -> Validator:
+        names = schema_type if isinstance(schema_type, list) else [schema_type]
+        python_types = tuple(t for name in names for t in _PYTHON_TYPES.get(name, ()))
+        allows_bool = "boolean" in names
+        allows_integral_float = "integer" in names and "number" not in names
+        expected = " or ".join(names)
+
+        def check_type(value):
+            if isinstance(value, python_types) and (allows_bool or not isinstance(value, bool)):
+                return None
+            if allows_integral_float and isinstance(value, float) and value.is_integer():
+                return None
+            return f": expected {expected}, got {_type_name(value)}"
+
+        return check_type
+
+    def _compile_enum(self, allowed) -> Validator:
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            # Unhashable members (objects/arrays), fall back to a list scan
+            allowed_set = None
+
+        def check_enum(value):
+            try:
+                if allowed_set is not None and value in allowed_set:
+                    return None
+            except TypeError:
+                pass
+            if allowed_set is None and value in allowed:
+                return None
+            return f": {value!r} is not one of {allowed}"
+
+        return check_enum
+
+    def _compile_range(self, schema) -> Validator:
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+        exclusive_min = schema.get("exclusiveMinimum")
+        exclusive_max = schema.get("exclusiveMaximum")
+        # OpenAPI 3.0 uses boolean exclusive flags, JSON schema uses numbers
+        if exclusive_min is True:
+            exclusive_min, minimum = minimum, None
+        elif exclusive_min is False:
+            exclusive_min = None
+        if exclusive_max is True:
+            exclusive_max, maximum = maximum, None
+        elif exclusive_max is False:
+            exclusive_max = None
+
+        def check_range(value):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return None
+            if minimum is not None and value < minimum:
+                return f": {value} is less than minimum {minimum}"
+            if maximum is not None and value > maximum:
+                return f": {value} is greater than maximum {maximum}"
+            if exclusive_min is not None and value <= exclusive_min:
+                return f": {value} must be greater than {exclusive_min}"
+            if exclusive_max is not None and value >= exclusive_max:
+                return f": {value} must be less than {exclusive_max}"
+            return None
+
+        return check_range
+
+    def _compile_string(self, schema) -> Validator:
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+
+        def check_string(value):
+            if not isinstance(value, str):
+                return None
+            if min_length is not None and len(value) < min_length:
+                return f": shorter than minLength {min_length}"
+            if max_length is not None and len(value) > max_length:
+                return f": longer than maxLength {max_length}"
+            if pattern is not None and not pattern.search(value):
+                return f": does not match pattern {pattern.pattern!r}"
+            return None
+
+        return check_string
+
+    def _compile_array(self, schema) -> Validator:
+        item_validator = self.compile(schema.get("items", {}))
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def check_array(value):
+            if not isinstance(value, list):
+                return None
+            if min_items is not None and len(value) < min_items:
+                return f": fewer than minItems {min_items}"
+            if max_items is not None and len(value) > max_items:
+                return f": more than maxItems {max_items}"
+            if item_validator is not _accept:
+                for index, item in enumerate(value):
+                    error = item_validator(item)
+                    if error:
+                        return f"[{index}]{error}"
+            return None
+
+        return check_array
+
+    def _compile_object(self, schema) -> Validator:
+        properties = tuple(
+            (name, self.compile(sub_schema))
+            for name, sub_schema in schema.get("properties", {}).items()
+        )
+        properties = tuple((name, v) for name, v in properties if v is not _accept)
+        required = tuple(schema.get("required", []))
+        additional = schema.get("additionalProperties", True)
+        known = frozenset(schema.get("properties", {}))
+        additional_validator = self.compile(additional) if isinstance(additional, dict) else None
+
+        def check_object(value):
+            if not isinstance(value, dict):
+                return None
+            for name in required:
+                if name not in value:
+                    return f": missing required property '{name}'"
+            for name, validator in properties:
+                if name in value:
+                    error = validator(value[name])
+                    if error:
+                        return f".{name}{error}"
+            if additional is False:
+                for name in value:
+                    if name not in known:
+                        return f": unexpected property '{name}'"
+            elif additional_validator is not None:
+                for name, item in value.items():
+                    if name not in known:
+                        error = additional_validator(item)
+                        if error:
+                            return f".{name}{error}"
+            return None
+
+        return check_object
+
+    def _compile_any_of(self, sub_schemas, exactly_one: bool) -> Validator:
+        validators = tuple(self.compile(sub_schema) for sub_schema in sub_schemas)
+        keyword = "oneOf" if exactly_one else "anyOf"
+
+        def check_any_of(value):
+            matches = 0
+            for validator in validators:
+                if validator(value) is None:
+                    matches += 1
+                    if not exactly_one:
+                        return None
+            if matches == 1 and exactly_one:
+                return None
+            return f": matches {matches} of the {keyword} schemas"
+
+        return check_any_of
+
+
+def find_response_schema(operation: Dict, status_code: int) -> Optional[Dict]:
+    """Return the JSON schema documented for a status code (exact, then 2XX style, then default)"""
+    responses = operation.get("responses", {})
+    response = (
+        responses.get(str(status_code))
+        or responses.get(f"{status_code // 100}XX")
+        or responses.get("default")
+    )
+    if not response:
+        return None
+
+    # Swagger 2 puts the schema on the response itself
+    if "schema" in response:
+        return response["schema"]
+    for content_type, media in response.get("content", {}).items():
+        if "json" in content_type and "schema" in media:
+            return media["schema"]
+    return None
+
+
+class CompiledSchema:
+    """
+    Validator functions compiled from one response schema. Holds no per-call
+    state, so one instance is cached per spec and shared between threads.
+    """
+
+    # Keywords that make a schema more than "an array whose items match items"
+    _NON_INCREMENTAL = ("allOf", "anyOf", "oneOf", "enum", "not")
+
+    def __init__(self, schema: Dict, spec: Dict):
+        compiler = _SchemaCompiler(spec)
+        if "$ref" in schema:
+            schema = compiler._resolve(schema["$ref"])
+        self.validate = compiler.compile(schema)
+
+        # A plain array schema can be checked element by element while the
+        # response streams; anything else is checked on the collected list
+        schema_type = schema.get("type")
+        self.incremental = (
+            (schema_type == "array" or (schema_type is None and "items" in schema))
+            and not any(key in schema for key in self._NON_INCREMENTAL)
+        )
+        self.item_validator = compiler.compile(schema.get("items", {})) if self.incremental else None
+        self.min_items = schema.get("minItems")
+        self.max_items = schema.get("maxItems")
+
+
+# Compiled schemas per spec object. load_api_spec returns the same object
+# until the file changes, so entries live as long as that version of the spec.
+_validator_cache: Dict[int, tuple] = {}
+_VALIDATOR_CACHE_SIZE = 32
+
+
+def get_response_validator(spec: Dict, endpoint: str, status_code: int) -> Optional["ResponseValidator"]:
+    """
+    Return a new validator for an endpoint's GET response, or None if no schema
+    is documented. The schema is compiled once per spec; each call gets its own
+    error and record counters.
+    """
+    entry = _validator_cache.get(id(spec))
+    if entry is None or entry[0] is not spec:
+        if len(_validator_cache) >= _VALIDATOR_CACHE_SIZE:
+            _validator_cache.pop(next(iter(_validator_cache)), None)
+        entry = (spec, {})
+        _validator_cache[id(spec)] = entry
+
+    compiled_schemas = entry[1]
+    key = (endpoint, status_code)
+    if key not in compiled_schemas:
+        operation = spec.get("paths", {}).get(endpoint, {}).get("get") or {}
+        schema = find_response_schema(operation, status_code)
+        compiled_schemas[key] = CompiledSchema(schema, spec) if schema is not None else None
+
+    compiled = compiled_schemas[key]
+    return ResponseValidator(compiled) if compiled is not None else None
+
+
+class ResponseValidator:
+    """
+    Validation state for one response, checked against a CompiledSchema.
+
+    Array responses can be checked element by element while they stream
+    (check_item then finish), other responses in one call (check_document).
+    Errors are collected rather than raised, and the time spent validating is
+    tracked to report throughput.
+    """
+
+    def __init__(self, compiled: CompiledSchema):
+        self.compiled = compiled
+        self.validate = compiled.validate
+        self.errors: List[str] = []
+        self.error_count = 0
+        self.records = 0
+        self.seconds = 0.0
+        # Streamed items kept for schemas that can only check the whole list
+        self._items: Optional[List] = None if compiled.incremental else []
+
+    def add_error(self, error: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def _check_item(self, item):
+        if self._items is not None:
+            self._items.append(item)
+        else:
+            error = self.compiled.item_validator(item)
+            if error:
+                self.add_error(f"$[{self.records}]{error}")
+        self.records += 1
+
+    def check_item(self, item):
+        """Validate one element of a streamed array response"""
+        start = time.perf_counter()
+        self._check_item(item)
+        self.seconds += time.perf_counter() - start
+
+    def _finish(self):
+        if self._items is not None:
+            error = self.validate(self._items)
+            if error:
+                self.add_error(f"${error}")
+            self._items = []
+        else:
+            compiled = self.compiled
+            if compiled.min_items is not None and self.records < compiled.min_items:
+                self.add_error(f"$: fewer than minItems {compiled.min_items}")
+            if compiled.max_items is not None and self.records > compiled.max_items:
+                self.add_error(f"$: more than maxItems {compiled.max_items}")
+
+    def finish(self):
+        """Apply array-level checks after the last streamed element"""
+        start = time.perf_counter()
+        self._finish()
+        self.seconds += time.perf_counter() - start
+
+    def check_document(self, value):
+        """Validate a whole (non-streamed) response body"""
+        start = time.perf_counter()
+        if self.compiled.incremental and isinstance(value, list):
+            # Check every element so all bad records are reported, not just the first
+            for item in value:
+                self._check_item(item)
+            self._finish()
+        else:
+            error = self.validate(value)
+            if error:
+                self.add_error(f"${error}")
+            self.records += 1
+        self.seconds += time.perf_counter() - start
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else float("inf")
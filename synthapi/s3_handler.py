@@ -2,31 +2,78 @@ import requests
 import json
 import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 from datetime import datetime
 from dotenv import load_dotenv
+from .compression import (
+    check_method,
+    compress,
+    decompress,
+    describe_savings,
+    get_upload_compression,
+    is_compressed_file
+)
+from .api_registry import mark_spec_deployed
+from .spec_versions import SpecDiff, diff_against_deployed, save_spec_version
+from .storage import StorageBackend, StorageError, get_storage_backend, storage_key
 
 load_dotenv()
 
+
+def _read_spec(spec_path: Path) -> Optional[dict]:
+    """Parse a spec file (possibly compressed on disk), or None if it is missing or invalid"""
+    try:
+        with open(spec_path, 'rb') as f:
+            return json.loads(decompress(f.read()))
+    except (OSError, ValueError):
+        return None
+
+
+class ExtendResult:
+    """What an extend uploaded and regenerated"""
+
+    def __init__(self, spec_changed: bool, spec_diff: Optional[SpecDiff], data_uploaded: bool,
+                 endpoints: Optional[List[str]]):
+        self.spec_changed = spec_changed
+        self.spec_diff = spec_diff
+        self.data_uploaded = data_uploaded
+        # Paths whose data was regenerated, None for all of them
+        self.endpoints = endpoints
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.spec_changed and not self.data_uploaded
+
+
 class S3Handler:
-    def __init__(self):
-        self.bucket_url = os.getenv('SUBHA_BUCKET_URL')
-        self.lambda_url = os.getenv('LAMBDA_URL')
+    def __init__(self, storage: Optional[str] = None, backend: Optional[StorageBackend] = None,
+                 compression: Optional[str] = None):
+        """
+        Args:
+            storage (str): Storage backend name ("s3" or "local"). Defaults to
+                the SYNTHAPI_STORAGE environment variable, then "s3".
+            backend (StorageBackend): Explicit backend instance, overrides storage
+            compression (str): Upload compression ("gzip" or "zstd"). Defaults to
+                the SYNTHAPI_UPLOAD_COMPRESSION environment variable, then none.
+        """
+        self.backend = backend or get_storage_backend(storage)
+        self.compression = check_method(compression) if compression else get_upload_compression()
+        # The Lambda builds the database from the S3 bucket, which never sees
+        # files written to local storage, so it is only called for S3
+        self.uses_database = self.backend.name != 'local'
+        self.lambda_url = os.getenv('LAMBDA_URL') if self.uses_database else None
         
-        if not self.bucket_url:
-            raise ValueError("SYNTHAPI_BUCKET_URL environment variable is not set")
-        if not self.lambda_url:
+        if self.uses_database and not self.lambda_url:
             raise ValueError("LAMBDA_URL environment variable is not set")
-            
-        self.bucket_url = self.bucket_url.rstrip('/')
     
     def upload_file(self, file_path: Path, dest_name: str) -> bool:
         """
-        Upload a file to S3 in the appropriate folder based on file type
+        Upload a file to storage in the appropriate folder based on file type
         
         Args:
             file_path (Path): Path to the local file
-            dest_name (str): Destination name in S3
+            dest_name (str): Destination name in storage
             
         Returns:
             bool: True if upload successful, False otherwise
@@ -37,61 +84,66 @@ class S3Handler:
                 return False
             
             # Determine subfolder based on file type
-            if dest_name.endswith('.json'):
-                subfolder = 'schemas'
-            elif dest_name.endswith('_data.txt'):
-                subfolder = 'raw'
-            else:
-                print(f"Error: Unsupported file type for {dest_name}")
+            try:
+                key = storage_key(dest_name)
+            except StorageError as e:
+                print(f"Error: {str(e)}")
                 return False
+            subfolder = key.split('/', 1)[0]
             
-            # Construct the full S3 URL with appropriate subfolder
-            url = f"{self.bucket_url}/{subfolder}/{dest_name}"
-            
-            # Read file content
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            # Determine content type
-            content_type = 'application/json' if dest_name.endswith('.json') else 'text/plain'
-            
-            # Upload to S3
-            response = requests.put(
-                url,
-                data=content,
-                headers={'Content-Type': content_type}
-            )
-            
-            if response.status_code in [200, 201]:
-                print(f"✓ Successfully uploaded {dest_name} to {subfolder}/")
-                return True
-            else:
-                print(f"✗ Error uploading {dest_name}: Status {response.status_code}")
+            detail = ""
+            try:
+                # Local storage keeps plain files, so compressing would only cost time
+                if self.compression and self.backend.name != 'local':
+                    with open(file_path, 'rb') as f:
+                        content = decompress(f.read())
+                    compressed = compress(content, self.compression)
+                    self.backend.put_bytes(compressed, key, content_encoding=self.compression)
+                    detail = f" ({self.compression}, {describe_savings(len(content), len(compressed))})"
+                elif is_compressed_file(file_path):
+                    # Specs may be stored compressed on disk, upload them as plain JSON
+                    with open(file_path, 'rb') as f:
+                        self.backend.put_bytes(decompress(f.read()), key)
+                else:
+                    self.backend.put(file_path, key)
+            except StorageError as e:
+                print(f"✗ Error uploading {dest_name}: {str(e)}")
                 return False
+            
+            print(f"✓ Successfully uploaded {dest_name} to {subfolder}/{detail}")
+            return True
                 
         except Exception as e:
             print(f"✗ Error uploading {dest_name}: {str(e)}")
             return False
 
-    def initialize_database(self, api_name: str) -> bool:
+    def initialize_database(self, api_name: str, endpoints: Optional[List[str]] = None) -> bool:
         """
         Initialize the database for an API by calling the Lambda function
         
         Args:
             api_name (str): Name of the API to initialize
+            endpoints (List[str]): Only regenerate data for these paths (all if None)
             
         Returns:
             bool: True if initialization successful, False otherwise
         """
+        scope = f" ({len(endpoints)} endpoints)" if endpoints is not None else ""
+        if not self.uses_database:
+            print(f"• Skipping database initialization for {api_name}{scope} (using {self.backend.name} storage)")
+            return True
+        
         try:
             # Construct Lambda URL with API name parameter
             lambda_request_url = f"{self.lambda_url}?API_NAME={api_name}"
+            if endpoints is not None:
+                lambda_request_url += f"&ENDPOINTS={quote(','.join(endpoints))}"
             
             # Make POST request to Lambda
             response = requests.post(lambda_request_url)
             
             if response.status_code in [200, 201]:
-                print(f"✓ Successfully initialized database for {api_name}")
+                print(f"✓ Successfully initialized database for {api_name}{scope}")
                 return True
             else:
                 print(f"✗ Error initializing database: Status {response.status_code}")
@@ -105,7 +157,7 @@ class S3Handler:
 
     def init_api(self, name: str, spec_path: Path, data_path: Path) -> bool:
         """
-        Initialize an API by uploading files to S3 and initializing the database
+        Initialize an API by uploading files to storage and initializing the database
         
         Args:
             name (str): API name
@@ -132,8 +184,63 @@ class S3Handler:
                 print("⚠️ Warning: Files uploaded but database initialization failed")
                 return False
 
+            # Remember which spec version was uploaded so extend can send only changes
+            spec = _read_spec(spec_path)
+            if spec:
+                mark_spec_deployed(name, save_spec_version(name, spec))
+
             return True
 
         except Exception as e:
             print(f"✗ Error during API initialization: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    def extend_api(self, name: str, spec_path: Path, data_path: Optional[Path] = None,
+                   full: bool = False) -> Optional[ExtendResult]:
+        """
+        Sync an initialized API with its spec and an optional new data prompt
+        
+        The spec is uploaded only if it changed since it was last deployed. A
+        new data prompt (or full=True) regenerates every endpoint; a spec
+        change on its own regenerates only the paths it touched.
+        
+        Args:
+            name (str): API name
+            spec_path (Path): Path to the OpenAPI spec JSON file
+            data_path (Path): Path to a new data file, or None to keep the current one
+            full (bool): Upload the spec and regenerate everything even if unchanged
+            
+        Returns:
+            ExtendResult: What was done, or None if a step failed
+        """
+        try:
+            spec = _read_spec(spec_path)
+            spec_diff = None
+            spec_changed = False
+            if spec:
+                deployed, current, spec_diff = diff_against_deployed(name, spec)
+                spec_changed = full or deployed != current
+
+            if not spec_changed and data_path is None:
+                return ExtendResult(False, spec_diff, False, [])
+
+            if spec_changed and not self.upload_file(spec_path, f"{name}.json"):
+                return None
+            if data_path is not None and not self.upload_file(data_path, f"{name}_data.txt"):
+                return None
+
+            if full or data_path is not None or not spec_changed:
+                endpoints = None
+            else:
+                endpoints = spec_diff.changed_paths()
+
+            if endpoints != [] and not self.initialize_database(name, endpoints):
+                return None
+
+            if spec_changed:
+                mark_spec_deployed(name, current)
+            return ExtendResult(spec_changed, spec_diff, data_path is not None, endpoints)
+
+        except Exception as e:
+            print(f"✗ Error during API extension: {str(e)}")
+            return None
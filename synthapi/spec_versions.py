@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .api_registry import GENERATED_API_DIR, get_spec_versions, record_spec_version
+from .response_validation import resolve_ref
+
+VERSIONS_DIR = GENERATED_API_DIR / "versions"
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# An operation is identified by (METHOD, path), e.g. ("GET", "/v1/users")
+Operation = Tuple[str, str]
+
+
+def _canonical(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def spec_hash(spec: Dict) -> str:
+    """Content address of a spec: the same content always gets the same version id"""
+    return hashlib.sha256(_canonical(spec)).hexdigest()
+
+
+def short_version(version: Optional[str]) -> str:
+    return version[:8] if version else "none"
+
+
+def _version_path(api_name: str, version: str) -> Path:
+    return VERSIONS_DIR / api_name / f"{version}.json"
+
+
+def save_spec_version(api_name: str, spec: Dict) -> str:
+    """
+    Store a spec under its content hash and record it in the registry
+
+    Returns:
+        str: The version id (unchanged specs are stored only once)
+    """
+    version = spec_hash(spec)
+    path = _version_path(api_name, version)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(_canonical(spec))
+        os.replace(tmp_path, path)
+
+    record_spec_version(api_name, version)
+    return version
+
+
+def load_spec_version(api_name: str, version: str) -> Optional[Dict]:
+    path = _version_path(api_name, version)
+    if not path.exists():
+        return None
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
+def _collect_refs(node, spec: Dict, seen: Set[str]):
+    """Find every local $ref reachable from node, following refs transitively"""
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if isinstance(ref, str) and ref.startswith('#/') and ref not in seen:
+            seen.add(ref)
+            _collect_refs(resolve_ref(spec, ref), spec, seen)
+        for value in node.values():
+            _collect_refs(value, spec, seen)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, spec, seen)
+
+
+def operation_hashes(spec: Dict) -> Dict[Operation, str]:
+    """
+    Hash each operation together with everything that affects it: path-level
+    parameters and any components it references. Editing a shared schema
+    therefore changes exactly the operations that use it.
+    """
+    hashes = {}
+    for path, path_item in spec.get('paths', {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        shared_parameters = path_item.get('parameters', [])
+        for method, operation in path_item.items():
+            if method not in HTTP_METHODS:
+                continue
+            refs: Set[str] = set()
+            _collect_refs([operation, shared_parameters], spec, refs)
+            content = {
+                'operation': operation,
+                'parameters': shared_parameters,
+                'refs': {ref: resolve_ref(spec, ref) for ref in sorted(refs)}
+            }
+            hashes[(method.upper(), path)] = hashlib.sha256(_canonical(content)).hexdigest()
+    return hashes
+
+
+class SpecDiff:
+    """Per-operation differences between two versions of a spec"""
+
+    def __init__(self, added: List[Operation], removed: List[Operation],
+                 changed: List[Operation], unchanged: List[Operation]):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.unchanged = unchanged
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def changed_paths(self) -> List[str]:
+        """Paths whose data needs regenerating (added, changed or removed operations)"""
+        return sorted({path for _, path in self.added + self.changed + self.removed})
+
+
+def diff_specs(old: Optional[Dict], new: Dict) -> SpecDiff:
+    """Compare two specs operation by operation. With no old spec everything is added."""
+    old_hashes = operation_hashes(old) if old else {}
+    new_hashes = operation_hashes(new)
+
+    added = sorted(op for op in new_hashes if op not in old_hashes)
+    removed = sorted(op for op in old_hashes if op not in new_hashes)
+    changed = sorted(op for op in new_hashes if op in old_hashes and new_hashes[op] != old_hashes[op])
+    unchanged = sorted(op for op in new_hashes if op in old_hashes and new_hashes[op] == old_hashes[op])
+    return SpecDiff(added, removed, changed, unchanged)
+
+
+def compare_with_deployed(api_name: str, spec: Dict) -> Tuple[Optional[str], str, SpecDiff]:
+    """
+    Diff a spec against the last deployed version without recording anything
+
+    Returns:
+        tuple: (deployed version or None, version of spec, diff)
+    """
+    deployed = get_spec_versions(api_name).get("deployed_version")
+    deployed_spec = load_spec_version(api_name, deployed) if deployed else None
+    return deployed, spec_hash(spec), diff_specs(deployed_spec, spec)
+
+
+def diff_against_deployed(api_name: str, spec: Dict) -> Tuple[Optional[str], str, SpecDiff]:
+    """
+    Record the current spec as a version and diff it against the last deployed version
+
+    Returns:
+        tuple: (deployed version or None, current version, diff)
+    """
+    save_spec_version(api_name, spec)
+    return compare_with_deployed(api_name, spec)
@@ -0,0 +1,220 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List, Optional
+
+import requests
+from dotenv import load_dotenv
+from .compression import decompress
+
+load_dotenv()
+
+STORAGE_BACKENDS = ("s3", "local")
+
+DEFAULT_LOCAL_STORAGE_DIR = Path(__file__).parent / "generated_apis" / "storage"
+
+
+class StorageError(Exception):
+    """Raised when a storage backend operation fails"""
+
+
+def storage_key(dest_name: str) -> str:
+    """
+    Map a destination file name to its key in the bucket layout
+
+    Specs (``NAME.json``) live under ``schemas/`` and LLM context files
+    (``NAME_data.txt``) under ``raw/``.
+    """
+    if dest_name.endswith('.json'):
+        return f"schemas/{dest_name}"
+    if dest_name.endswith('_data.txt'):
+        return f"raw/{dest_name}"
+    raise StorageError(f"Unsupported file type for {dest_name}")
+
+
+def content_type_for(key: str) -> str:
+    return 'application/json' if key.endswith('.json') else 'text/plain'
+
+
+class StorageBackend(ABC):
+    """Interface for where API specs and context data are stored"""
+
+    name = "base"
+
+    @abstractmethod
+    def put(self, file_path: Path, key: str):
+        """Store the contents of a local file under key"""
+
+    @abstractmethod
+    def put_bytes(self, data: bytes, key: str, content_encoding: Optional[str] = None):
+        """Store data under key, optionally marked as compressed with content_encoding"""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Return the contents stored under key"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Return whether anything is stored under key"""
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> List[str]:
+        """Return all keys starting with prefix"""
+
+    def describe(self, key: str) -> str:
+        """Human readable location of a key, for messages"""
+        return key
+
+
+class HTTPStorageBackend(StorageBackend):
+    """Stores files in the S3 bucket through plain HTTP requests"""
+
+    name = "s3"
+
+    def __init__(self, bucket_url: str):
+        self.bucket_url = bucket_url.rstrip('/')
+
+    def _url(self, key: str) -> str:
+        return f"{self.bucket_url}/{key}"
+
+    def put(self, file_path: Path, key: str):
+        # Send bytes rather than the file object: requests streams an empty file
+        # with chunked transfer encoding, which S3 rejects
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        self.put_bytes(data, key)
+
+    def put_bytes(self, data: bytes, key: str, content_encoding: Optional[str] = None):
+        headers = {'Content-Type': content_type_for(key)}
+        if content_encoding:
+            headers['Content-Encoding'] = content_encoding
+        response = requests.put(self._url(key), data=data, headers=headers)
+        if response.status_code not in [200, 201]:
+            raise StorageError(f"Status {response.status_code}")
+
+    def get(self, key: str) -> bytes:
+        response = requests.get(self._url(key))
+        if response.status_code != 200:
+            raise StorageError(f"Status {response.status_code}")
+        # requests decodes gzip itself, zstd only when urllib3 supports it
+        return decompress(response.content)
+
+    def exists(self, key: str) -> bool:
+        response = requests.head(self._url(key))
+        return response.status_code == 200
+
+    def list(self, prefix: str = "") -> List[str]:
+        keys = []
+        params = {'list-type': '2', 'prefix': prefix}
+        while True:
+            response = requests.get(self.bucket_url, params=params)
+            if response.status_code != 200:
+                raise StorageError(f"Status {response.status_code}")
+
+            root = ET.fromstring(response.content)
+            # S3 responses are namespaced, so match on the local tag name
+            for element in root.iter():
+                if element.tag.endswith('}Key') or element.tag == 'Key':
+                    keys.append(element.text)
+
+            token = next((e.text for e in root.iter() if e.tag.endswith('NextContinuationToken')), None)
+            if not token:
+                return keys
+            params['continuation-token'] = token
+
+    def describe(self, key: str) -> str:
+        return self._url(key)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores files in a local directory using the same schemas/ and raw/ layout
+
+    Writes go to a temporary file in the destination directory followed by an
+    atomic rename, so readers never see a partially written file.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path = DEFAULT_LOCAL_STORAGE_DIR):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put(self, file_path: Path, key: str):
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+        os.close(fd)
+        try:
+            # copyfile uses the kernel's zero-copy path (sendfile) where available
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, dest)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise StorageError(str(e))
+
+    def put_bytes(self, data: bytes, key: str, content_encoding: Optional[str] = None):
+        """Store data under key. Local files are always stored uncompressed."""
+        if content_encoding:
+            data = decompress(data)
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, dest)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise StorageError(str(e))
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except OSError as e:
+            raise StorageError(str(e))
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def list(self, prefix: str = "") -> List[str]:
+        if not self.root.exists():
+            return []
+        keys = [
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and not path.name.startswith(".")
+        ]
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def describe(self, key: str) -> str:
+        return str(self._path(key))
+
+
+def get_storage_backend(name: Optional[str] = None) -> StorageBackend:
+    """
+    Create the storage backend selected by name, or by the SYNTHAPI_STORAGE
+    environment variable when no name is given (defaults to s3)
+    """
+    name = (name or os.getenv('SYNTHAPI_STORAGE') or 's3').lower()
+
+    if name == 'local':
+        root = os.getenv('SYNTHAPI_STORAGE_DIR')
+        return LocalStorageBackend(Path(root) if root else DEFAULT_LOCAL_STORAGE_DIR)
+
+    if name == 's3':
+        bucket_url = os.getenv('SUBHA_BUCKET_URL')
+        if not bucket_url:
+            raise ValueError("SUBHA_BUCKET_URL environment variable is not set")
+        return HTTPStorageBackend(bucket_url)
+
+    raise ValueError(f"Invalid storage backend: {name}. Must be one of: {', '.join(STORAGE_BACKENDS)}")
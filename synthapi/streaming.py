@@ -0,0 +1,212 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Tuple
+
+import typer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library is the fallback
+    orjson = None
+
+OUTPUT_FORMATS = ("pretty", "compact", "ndjson")
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+def loads(raw: str) -> Any:
+    """Parse JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson rejects a few documents the standard library accepts (e.g. huge ints)
+            pass
+    return json.loads(raw)
+
+
+def dumps(obj: Any, fmt: str = "pretty") -> str:
+    """Serialize an object for display in the given output format"""
+    if orjson is not None:
+        try:
+            option = orjson.OPT_INDENT_2 if fmt == "pretty" else 0
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    if fmt == "pretty":
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def iter_text(response, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Decode a streamed response body chunk by chunk"""
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_top_level(chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Split a JSON body into top-level pieces as the chunks arrive.
+
+    For an array body yields ("item", raw_text) for each element as soon as it
+    is complete, so only one element is held in memory at a time. Any other
+    body is accumulated and yielded once as ("document", raw_text).
+    """
+    chunks = iter(chunks)
+    buf = ""
+    for chunk in chunks:
+        buf += chunk
+        if buf.strip():
+            break
+    else:
+        yield "document", buf
+        return
+
+    stripped = buf.lstrip()
+    if not stripped.startswith("["):
+        yield "document", buf + "".join(chunks)
+        return
+
+    # Item boundaries come from the C-accelerated raw_decode. The buffer is
+    # only rebuilt when more input is needed, and after a failed attempt the
+    # next one waits until the unparsed tail has doubled, so splitting stays
+    # linear even when one item spans many chunks.
+    buf = stripped[1:]
+    pos = 0
+    need = 0
+    exhausted = False
+    expect_item = True
+    first = True
+
+    while True:
+        if need:
+            parts = [buf[pos:]]
+            size = len(parts[0])
+            while size < need:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                parts.append(chunk)
+                size += len(chunk)
+            buf = "".join(parts)
+            pos = 0
+            need = 0
+
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos == len(buf):
+            if exhausted:
+                raise ValueError("Response ended before the JSON array was closed")
+            need = 1
+            continue
+
+        char = buf[pos]
+        if not expect_item:
+            # A comma or the closing bracket of the top-level array ends an item
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("Malformed JSON array in response")
+            pos += 1
+            expect_item = True
+            continue
+
+        if char == "]" and first:
+            return
+        if char in ",]":
+            raise ValueError("Malformed JSON array in response")
+        try:
+            end = _DECODER.raw_decode(buf, pos)[1]
+        except ValueError:
+            if exhausted:
+                raise ValueError("Malformed or truncated JSON array in response")
+            need = 2 * (len(buf) - pos)
+            continue
+        if end == len(buf) and not exhausted:
+            # A number at the end of the buffer may continue in the next chunk
+            need = len(buf) - pos + 1
+            continue
+
+        yield "item", buf[pos:end]
+        pos = end
+        expect_item = False
+        first = False
+
+
+def render_response(response, fmt: str = "pretty", validator=None):
+    """
+    Print a streamed response body incrementally.
+
+    Array elements are printed as they are parsed, one per line for ndjson.
+    Bodies that are not JSON are printed as raw text. When a ResponseValidator
+    is given, each element is validated as it streams.
+    """
+    count = 0
+    # Rendered items are echoed in batches, echoing each one costs more than rendering it
+    pending = []
+    pending_size = 0
+
+    def emit(text: str):
+        nonlocal pending_size
+        pending.append(text)
+        pending_size += len(text)
+        if pending_size >= CHUNK_SIZE:
+            flush()
+
+    def flush():
+        nonlocal pending_size
+        if pending:
+            typer.echo("".join(pending), nl=False)
+            pending.clear()
+            pending_size = 0
+
+    for kind, raw in iter_top_level(iter_text(response)):
+        if kind == "document":
+            try:
+                obj = loads(raw)
+            except ValueError:
+                if validator is not None:
+                    validator.add_error("$: response body is not JSON")
+                typer.echo(raw)
+                return
+            if validator is not None:
+                validator.check_document(obj)
+            if fmt == "ndjson" and isinstance(obj, list):
+                for item in obj:
+                    emit(dumps(item, "compact") + "\n")
+                flush()
+            else:
+                typer.echo(dumps(obj, fmt))
+            return
+
+        item = loads(raw)
+        if validator is not None:
+            validator.check_item(item)
+        if fmt == "ndjson":
+            emit(dumps(item, "compact") + "\n")
+        elif fmt == "compact":
+            emit(("[" if count == 0 else ",") + dumps(item, "compact"))
+        else:
+            rendered = dumps(item, "pretty").replace("\n", "\n  ")
+            emit(("[\n  " if count == 0 else ",\n  ") + rendered)
+        count += 1
+
+    flush()
+    if validator is not None:
+        validator.finish()
+    if fmt == "ndjson":
+        return
+    if count == 0:
+        typer.echo("[]")
+    else:
+        typer.echo("]" if fmt == "compact" else "\n]")
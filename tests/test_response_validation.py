@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from synthapi.response_validation import _SchemaCompiler, get_response_validator
+
+
+def compile_schema(schema, root=None):
+    return _SchemaCompiler(root or {}).compile(schema)
+
+
+def spec_with_response(schema, components=None):
+    return {
+        "paths": {"/items": {"get": {"responses": {"200": {"content": {"application/json": {"schema": schema}}}}}}},
+        "components": {"schemas": components or {}},
+    }
+
+
+def stream(validator, items):
+    for item in items:
+        validator.check_item(item)
+    validator.finish()
+    return validator
+
+
+@pytest.mark.parametrize("schema, value, error", [
+    ({"type": "string"}, "a", None),
+    ({"type": "string"}, 1, ": expected string, got integer"),
+    ({"type": "integer"}, True, ": expected integer, got boolean"),
+    ({"type": "integer"}, 2.0, None),
+    ({"type": "number"}, 1, None),
+    ({"type": ["string", "null"]}, None, None),
+    ({"type": "string", "nullable": True}, None, None),
+    ({"enum": ["a", "b"]}, "c", ": 'c' is not one of ['a', 'b']"),
+    ({"minimum": 1}, 0, ": 0 is less than minimum 1"),
+    ({"maximum": 5, "exclusiveMaximum": True}, 5, ": 5 must be less than 5"),
+    ({"pattern": "^a"}, "ba", ": does not match pattern '^a'"),
+    ({"maxLength": 2}, "abc", ": longer than maxLength 2"),
+    ({"items": {"type": "integer"}}, [1, "x"], "[1]: expected integer, got string"),
+    ({"minItems": 1}, [], ": fewer than minItems 1"),
+    ({"required": ["id"]}, {}, ": missing required property 'id'"),
+    ({"properties": {"id": {"type": "integer"}}}, {"id": "1"}, ".id: expected integer, got string"),
+    ({"properties": {"id": {}}, "additionalProperties": False}, {"x": 1}, ": unexpected property 'x'"),
+    ({"additionalProperties": {"type": "string"}}, {"x": 1}, ".x: expected string, got integer"),
+    ({"anyOf": [{"type": "string"}, {"type": "integer"}]}, 1.5, ": matches 0 of the anyOf schemas"),
+    ({"oneOf": [{"type": "number"}, {"type": "integer"}]}, 1, ": matches 2 of the oneOf schemas"),
+    ({"allOf": [{"type": "object"}, {"required": ["a"]}]}, {}, ": missing required property 'a'"),
+    ({}, object(), None),
+])
+def test_compiled_checks(schema, value, error):
+    assert compile_schema(schema)(value) == error
+
+
+def test_refs_resolve_escapes_and_recursion():
+    root = {
+        "components": {"schemas": {
+            "a/b": {"type": "string"},
+            "Node": {"properties": {"child": {"$ref": "#/components/schemas/Node"}, "name": {"$ref": "#/components/schemas/a~1b"}}},
+        }}
+    }
+    validate = compile_schema({"$ref": "#/components/schemas/Node"}, root)
+    assert validate({"child": {"child": {"name": "x"}}}) is None
+    assert validate({"child": {"name": 1}}) == ".child.name: expected string, got integer"
+
+
+def test_streamed_array_reports_each_bad_item():
+    spec = spec_with_response({"type": "array", "items": {"type": "integer"}, "maxItems": 3})
+    validator = stream(get_response_validator(spec, "/items", 200), [1, "a", 3, "b"])
+    assert validator.records == 4
+    assert validator.errors == [
+        "$[1]: expected integer, got string",
+        "$[3]: expected integer, got string",
+        "$: more than maxItems 3",
+    ]
+
+
+@pytest.mark.parametrize("schema", [
+    {"description": "any"},
+    {"anyOf": [{"type": "array"}, {"type": "object"}]},
+    {"type": ["array", "null"]},
+    {"type": "array", "items": {"type": "integer"}, "allOf": [{"maxItems": 5}]},
+])
+def test_streamed_items_accepted_by_non_plain_array_schemas(schema):
+    validator = stream(get_response_validator(spec_with_response(schema), "/items", 200), [1, 2])
+    assert validator.ok
+    assert validator.records == 2
+
+
+def test_streamed_items_checked_as_a_list_by_non_plain_schemas():
+    schema = {"oneOf": [{"type": "object"}, {"type": "array", "items": {"type": "string"}}]}
+    validator = stream(get_response_validator(spec_with_response(schema), "/items", 200), ["a", 1])
+    assert validator.errors == ["$: matches 0 of the oneOf schemas"]
+
+
+def test_document_and_missing_schema():
+    spec = spec_with_response({"$ref": "#/components/schemas/Item"}, {"Item": {"required": ["id"]}})
+    validator = get_response_validator(spec, "/items", 200)
+    validator.check_document({})
+    assert validator.errors == ["$: missing required property 'id'"]
+    assert get_response_validator(spec, "/items", 404) is None
+    assert get_response_validator(spec, "/other", 200) is None
+
+
+def test_each_call_gets_its_own_state():
+    spec = spec_with_response({"type": "array", "items": {"type": "integer"}})
+    first = get_response_validator(spec, "/items", 200)
+    first.check_item("bad")
+    second = get_response_validator(spec, "/items", 200)
+    second.check_item(1)
+
+    assert first is not second
+    assert first.compiled is second.compiled
+    assert (first.error_count, first.records) == (1, 1)
+    assert (second.error_count, second.records) == (0, 1)
+
+
+def test_concurrent_streams_do_not_share_errors():
+    spec = spec_with_response({"type": "array", "items": {"type": "integer"}})
+    results = {}
+
+    def run(name, items):
+        results[name] = stream(get_response_validator(spec, "/items", 200), items)
+
+    threads = [
+        threading.Thread(target=run, args=(i, ["bad"] * i + [1] * 1000))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, validator in results.items():
+        assert validator.error_count == i
+        assert validator.records == i + 1000
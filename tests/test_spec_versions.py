@@ -0,0 +1,62 @@
+import copy
+
+from synthapi.response_validation import resolve_ref
+from synthapi.spec_versions import diff_specs, operation_hashes
+
+SPEC = {
+    "paths": {
+        "/users": {
+            "get": {"responses": {"200": {"$ref": "#/components/responses/Users"}}},
+        },
+        "/users/{id}": {
+            "parameters": [{"$ref": "#/components/parameters/Id"}],
+            "get": {"responses": {"200": {"description": "A user"}}},
+        },
+        "/teams": {
+            "get": {"responses": {"200": {"$ref": "#/paths/~1users/get/responses/200"}}},
+        },
+    },
+    "components": {
+        "responses": {"Users": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/User"}}}}},
+        "parameters": {"Id": {"name": "id", "in": "path", "schema": {"type": "string"}}},
+        "schemas": {"User": {"type": "object", "properties": {"name": {"type": "string"}}}},
+    },
+}
+
+
+def test_resolve_ref_undoes_pointer_escapes():
+    assert resolve_ref(SPEC, "#/paths/~1users/get") is SPEC["paths"]["/users"]["get"]
+    assert resolve_ref({"a~b": {"c": [1, 2]}}, "#/a~0b/c/1") == 2
+    assert resolve_ref(SPEC, "#/paths/~1missing") is None
+    assert resolve_ref(SPEC, "other.json#/x") is None
+
+
+def test_unchanged_spec_has_empty_diff():
+    spec_diff = diff_specs(SPEC, copy.deepcopy(SPEC))
+    assert spec_diff.is_empty
+    assert len(spec_diff.unchanged) == 3
+
+
+def test_shared_schema_change_marks_its_users_changed():
+    new = copy.deepcopy(SPEC)
+    new["components"]["schemas"]["User"]["properties"]["age"] = {"type": "integer"}
+    spec_diff = diff_specs(SPEC, new)
+    # /teams reaches User through an escaped pointer into /users
+    assert spec_diff.changed == [("GET", "/teams"), ("GET", "/users")]
+    assert spec_diff.changed_paths() == ["/teams", "/users"]
+
+
+def test_path_parameter_change_marks_operation_changed():
+    new = copy.deepcopy(SPEC)
+    new["components"]["parameters"]["Id"]["schema"]["type"] = "integer"
+    assert diff_specs(SPEC, new).changed == [("GET", "/users/{id}")]
+
+
+def test_added_and_removed_operations():
+    new = copy.deepcopy(SPEC)
+    del new["paths"]["/teams"]
+    new["paths"]["/users"]["post"] = {"responses": {}}
+    spec_diff = diff_specs(SPEC, new)
+    assert spec_diff.added == [("POST", "/users")]
+    assert spec_diff.removed == [("GET", "/teams")]
+    assert diff_specs(None, SPEC).added == sorted(operation_hashes(SPEC))
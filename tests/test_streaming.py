@@ -0,0 +1,106 @@
+import json
+import math
+
+import pytest
+
+from synthapi import streaming
+from synthapi.streaming import iter_top_level
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def split(text, size):
+    return list(iter_top_level(chunked(text, size)))
+
+
+ITEMS = [
+    {"id": 1, "name": "plain"},
+    {"text": "commas, [brackets] and {braces}"},
+    {"escaped": "quote \" and backslash \\ and \\\" mixed"},
+    [1, [2, [3]], {"a": []}],
+    "string item",
+    42,
+    None,
+    {"unicode": "café ☃"},
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_array_items_survive_any_chunking(size):
+    body = json.dumps(ITEMS, indent=2)
+    pieces = split(body, size)
+    assert [kind for kind, _ in pieces] == ["item"] * len(ITEMS)
+    assert [json.loads(raw) for _, raw in pieces] == ITEMS
+
+
+@pytest.mark.parametrize("body", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_empty_array(body):
+    assert split(body, 1) == []
+
+
+@pytest.mark.parametrize("body", ['{"a": [1, 2]}', '"text"', "not json", ""])
+def test_other_bodies_are_one_document(body):
+    assert split(body, 2) == [("document", body)]
+
+
+def test_unterminated_array_raises():
+    with pytest.raises(ValueError):
+        split('[1, 2, {"a": 3}', 4)
+
+
+def test_empty_item_raises():
+    with pytest.raises(ValueError):
+        split("[1,,2]", 64)
+
+
+class CountingDecoder:
+    """Wraps the splitter's decoder to count attempts and the characters they scan"""
+
+    def __init__(self):
+        self.calls = 0
+        self.scanned = 0
+
+    def raw_decode(self, s, idx):
+        self.calls += 1
+        try:
+            obj, end = json.JSONDecoder().raw_decode(s, idx)
+        except ValueError:
+            self.scanned += len(s) - idx
+            raise
+        self.scanned += end - idx
+        return obj, end
+
+
+@pytest.fixture
+def decoder(monkeypatch):
+    counting = CountingDecoder()
+    monkeypatch.setattr(streaming, "_DECODER", counting)
+    return counting
+
+
+@pytest.mark.parametrize("size", [64, 1 << 12, 1 << 20])
+def test_many_items_are_split_with_linear_work(decoder, size):
+    items = [{"id": i, "name": f"item {i}"} for i in range(20000)]
+    body = json.dumps(items)
+    chunks = chunked(body, size)
+
+    pieces = list(iter_top_level(chunks))
+
+    assert len(pieces) == len(items)
+    # One attempt per item, plus at most one retry per chunk boundary
+    assert decoder.calls <= len(items) + len(chunks) + 1
+    assert decoder.scanned <= 2 * len(body)
+
+
+def test_item_spanning_many_chunks_is_retried_logarithmically(decoder):
+    body = json.dumps(["x" * (1 << 20), 1])
+    chunks = chunked(body, 1024)
+
+    pieces = list(iter_top_level(chunks))
+
+    assert [json.loads(raw) for _, raw in pieces] == ["x" * (1 << 20), 1]
+    # The required tail doubles after every failed attempt
+    assert decoder.calls <= 2 * math.log2(len(chunks)) + 4
+    assert decoder.scanned <= 4 * len(body)